@@ -11,6 +11,15 @@ import warnings
 pol_dict = {'XX': 0, 'XY': 1, 'YX': 2, 'YY':	3}
 
 
+def _modified_zscore(data):
+    """
+    Returns the modified z-score, (data - median) / MAD, ignoring nans
+    - data: 1D numpy array
+    """
+    diff = data - np.nanmedian(data)
+    return diff / np.nanmedian(np.abs(diff))
+
+
 class CalMetrics(object):
     def __init__(self, calfits_path, metafits_path, pol='X',
                  norm=True, ref_antenna=None):
@@ -83,26 +92,18 @@ class CalMetrics(object):
         return np.nanmax(skewness, axis=0)
 
     def unused_baselines_percent(self):
-        inds_nan = np.where(np.isnan(self.CalFits.baseline_weights))[0]
-        inds_wg0 = np.where(self.CalFits.baseline_weights == 0)[0]
-        return (len(inds_nan) + len(inds_wg0)) / \
-            len(self.CalFits.baseline_weights) * 100
+        weights = self.CalFits.baseline_weights
+        return np.mean(np.isnan(weights) | (weights == 0)) * 100
 
     def unused_channels_percent(self):
-        inds = np.where(np.array(self.CalFits.frequency_flags) == 1)[0]
-        return len(inds) / len(self.CalFits.frequency_flags) * 100
+        return np.mean(self.CalFits.frequency_flags == 1) * 100
 
     def unused_antennas_percent(self):
-        inds = np.where(np.array(self.CalFits.antenna_flags) == 1)[0]
-        return len(inds) / len(self.CalFits.antenna_flags) * 100
+        return np.mean(self.CalFits.antenna_flags == 1) * 100
 
     def non_converging_percent(self):
-        sh = self.CalFits.convergence.shape
-        count = 0
-        for t in range(sh[0]):
-            inds = np.where(np.isnan(self.CalFits.convergence[t, :]))[0]
-            count += len(inds)
-        return count / (sh[0] * sh[1]) * 100
+        convergence = self.CalFits.convergence
+        return np.isnan(convergence).sum() / convergence.size * 100
 
     def convergence_variance(self):
         return np.nanmax(np.nanvar(self.CalFits.convergence, axis=1))
@@ -110,20 +111,17 @@ class CalMetrics(object):
     def receiver_metrics(self):
         # metrics based on antennas connected to receivers
         warnings.filterwarnings("ignore")
-        pols = list(pol_dict.keys())
-        ntimes = self.CalFits.Ntime
         receivers = np.unique(self.MetaFits.receiver_ids)
-        nants = len(self.MetaFits.antenna_numbers_for_receiver(receivers[0]))
-        rcv_chisq = np.zeros((len(receivers), nants, len(pols)))
-        for i, r in enumerate(receivers):
-            rcv_gains = self.CalFits.gains_for_receiver(self.metafits_path, r)
-            rcv_amps = np.nanmean(np.abs(rcv_gains), axis=0)
-            # ignoring zero division
-            np.seterr(divide='ignore', invalid='ignore')
-            rcv_amps_mean = np.nanmean(rcv_amps, axis=0)
-            chisq = np.nansum(((rcv_amps - rcv_amps_mean) / rcv_amps), axis=1)
-            rcv_chisq[i] = chisq
-        return rcv_chisq
+        # antenna numbers grouped by receiver (receivers, antennas)
+        order = np.argsort(self.MetaFits.receiver_ids, kind='stable')
+        rcv_annumbers = self.MetaFits.antenna_numbers[order].reshape(
+            len(receivers), -1)
+        rcv_amps = np.nanmean(self.CalFits.amplitudes[
+            :, self.CalFits.gains_ind_for(rcv_annumbers), :, :], axis=0)
+        # ignoring zero division
+        np.seterr(divide='ignore', invalid='ignore')
+        rcv_amps_mean = np.nanmean(rcv_amps, axis=1, keepdims=True)
+        return np.nansum(((rcv_amps - rcv_amps_mean) / rcv_amps), axis=2)
 
     def delay_spectra_bls(self):
         """
@@ -134,20 +132,23 @@ class CalMetrics(object):
 
         fft_gains = self.CalFits.fft_gains()
         antpairs = self.MetaFits.antpairs
-        cross_bls = np.array(
-            [bl for bl in self.MetaFits.baseline_lengths if bl != 0.0])
+        baseline_lengths = self.MetaFits.baseline_lengths
+        cross_bls = baseline_lengths[baseline_lengths != 0.0]
         inds = np.argsort(cross_bls)
-        cross_antpairs = np.array([tuple(antp)
-                                  for antp in antpairs if antp[0] != antp[1]])
+        cross_antpairs = antpairs[antpairs[:, 0] != antpairs[:, 1]]
         cross_antpairs_sorted = cross_antpairs[inds]
         cross_bls_sorted = cross_bls[inds]
 
-        dfft_array = np.zeros(
-            (fft_gains.shape[0], len(cross_antpairs_sorted), fft_gains.shape[2], fft_gains.shape[3]), dtype=fft_gains.dtype)
-
-        for j in range(8128):
-            dfft_array[:, j, :, :] = fft_gains[:, cross_antpairs_sorted[j][0],
-                                               :, :] * np.conj(fft_gains[:, cross_antpairs_sorted[j][1], :, :])
+        _sh = fft_gains.shape
+        dfft_array = np.empty(
+            (_sh[0], len(cross_antpairs_sorted), _sh[2], _sh[3]), dtype=fft_gains.dtype)
+        # filling in blocks of baselines to bound the temporary arrays
+        nblock = 256
+        for i in range(0, len(cross_antpairs_sorted), nblock):
+            antp = cross_antpairs_sorted[i:i + nblock]
+            dfft_block = dfft_array[:, i:i + nblock, :, :]
+            np.conj(fft_gains[:, antp[:, 1], :, :], out=dfft_block)
+            dfft_block *= fft_gains[:, antp[:, 0], :, :]
 
         return cross_bls_sorted, dfft_array
 
@@ -207,13 +208,10 @@ class CalMetrics(object):
 
     def run_metrics(self, ant_threshold=10):
         self._initialize_metrics_dict()
-        gains = self.CalFits.gain_array
         fft_gains = self.CalFits.fft_gains()
-        # normalizing gains by median across antenna
-        gain_amps = np.abs(gains)
+        # amplitudes are already evaluated by CalFits, reusing them
+        gain_amps = self.CalFits.amplitudes
         _sh = gain_amps.shape
-        # metrics amplitude across frequency
-        rms_amp_freq = np.sqrt(np.nanmean(gain_amps ** 2, axis=2) / _sh[2])
         # skewness
         skewness = self.skewness_across_uvcut(self.metrics['UVCUT'])
         # receiver metrics
@@ -222,12 +220,14 @@ class CalMetrics(object):
         vmrcv_chisq = np.nanvar(mrcv_chisq, axis=0)
 
         for p in ['XX', 'YY']:
-            rms_amp_freq_p = np.nanmean(rms_amp_freq, axis=0)[:, pol_dict[p]]
-            # print(rms_amp_freq_p)
+            # metrics amplitude across frequency, only evaluated for the
+            # polarizations written to the metrics
+            gain_amps_p = gain_amps[:, :, :, pol_dict[p]]
+            rms_amp_freq = np.sqrt(np.nanmean(
+                gain_amps_p ** 2, axis=2) / _sh[2])
+            rms_amp_freq_p = np.nanmean(rms_amp_freq, axis=0)
             # calculating modified zscore
-            rms_median = np.nanmedian(rms_amp_freq_p)
-            rms_modz = (rms_amp_freq_p - rms_median) / \
-                (np.nanmedian(np.abs(rms_amp_freq_p - rms_median)))
+            rms_modz = _modified_zscore(rms_amp_freq_p)
             # determining misbehaving antennas using modified z-score
             inds = np.where((rms_modz < -1 * ant_threshold)
                             | (rms_modz > ant_threshold))
@@ -236,13 +236,11 @@ class CalMetrics(object):
             fft_amps = np.abs(np.nanmean(
                 fft_gains[:, :, :, pol_dict[p]], axis=0))
             fft_power = np.nansum(fft_amps, axis=1)
-            fft_power_median = np.nanmedian(fft_power)
-            fft_power_modz = (fft_power - fft_power_median) / \
-                (np.nanmedian(np.abs(fft_power - fft_power_median)))
+            fft_power_modz = _modified_zscore(fft_power)
             inds = np.where((fft_power_modz < -1 * ant_threshold)
                             | (fft_power_modz > ant_threshold))
             bad_ants2 = self.CalFits.antenna[inds[0]]
-            bad_ants = np.unique(bad_ants1.tolist() + bad_ants2.tolist())
+            bad_ants = np.union1d(bad_ants1, bad_ants2)
 
             # writing to metrics dict
             self.metrics[p]['RMS'] = rms_amp_freq_p
@@ -253,8 +251,8 @@ class CalMetrics(object):
             self.metrics[p]['DFFT_POWER'] = np.nansum(fft_amps)
 
         self.metrics['PERCENT_UNUSED_BLS'] = self.unused_baselines_percent()
-        self.metrics['BAD_ANTS'] = np.unique(
-            self.metrics['XX']['BAD_ANTS'].tolist() + self.metrics['XX']['BAD_ANTS'].tolist())
+        self.metrics['BAD_ANTS'] = np.union1d(
+            self.metrics['XX']['BAD_ANTS'], self.metrics['YY']['BAD_ANTS'])
         self.metrics['PERCENT_NONCONVERGED_CHS'] = self.non_converging_percent()
         self.metrics['PERCENT_BAD_ANTS'] = len(
             self.metrics['BAD_ANTS']) / self.MetaFits.Nants * 100
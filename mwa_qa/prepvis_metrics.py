@@ -97,15 +97,13 @@ class PrepvisMetrics(object):
 
     def plot_spectra_across_chan(self, freq_chan, mode='log', save=None, figname=None):
         autos = self.autos()
-        _sh = autos.shape
         plot_data = self._plot_mode(
             autos[:, :, freq_chan, :], mode=mode)
         fig = pylab.figure(figsize=(9, 7))
         pylab.suptitle('Channel {}'.format(freq_chan))
         for i in range(4):
             ax = pylab.subplot(2, 2, i + 1)
-            for j in range(_sh[1]):
-                ax.plot(plot_data[:, j, i], '.-', alpha=0.5)
+            ax.plot(plot_data[:, :, i], '.-', alpha=0.5)
             ax.set_title(list(pol_dict.keys())[i])
             ax.grid(ls='dotted')
             if i % 2 == 0:
@@ -125,15 +123,13 @@ class PrepvisMetrics(object):
 
     def plot_spectra_across_time(self, timestamp, mode='log', save=None, figname=None):
         autos = self.autos()
-        _sh = autos.shape
         plot_data = self._plot_mode(
             autos[timestamp, :, :, :], mode=mode)
         fig = pylab.figure(figsize=(9, 7))
         pylab.suptitle('Timetamp {}'.format(timestamp))
         for i in range(4):
             ax = pylab.subplot(2, 2, i + 1)
-            for j in range(_sh[1]):
-                ax.plot(plot_data[j, :, i], '.-', alpha=0.5)
+            ax.plot(plot_data[:, :, i].T, '.-', alpha=0.5)
             ax.set_title(list(pol_dict.keys())[i])
             ax.grid(ls='dotted')
             if i % 2 == 0:
@@ -158,12 +154,13 @@ class PrepvisMetrics(object):
             autos[:, annumber, :, :], mode=mode)
         fig = pylab.figure(figsize=(8, 7))
         pylab.suptitle('Ant {} -- {}'.format(annumber, mode))
+        # colour limits for all the panels
+        vmins = np.nanmin(plot_data, axis=(0, 1))
+        vmaxs = np.nanmax(plot_data, axis=(0, 1))
         for i in range(4):
             ax = pylab.subplot(2, 2, i + 1)
-            vmin = np.nanmin(plot_data[:, :, i])
-            vmax = np.nanmax(plot_data[:, :, i])
             im = ax.imshow(plot_data[:, :, i],
-                           aspect='auto', vmin=vmin, vmax=vmax)
+                           aspect='auto', vmin=vmins[i], vmax=vmaxs[i])
             ax.set_title(list(pol_dict.keys())[i])
             pylab.colorbar(im)
             if i % 2 == 0:
@@ -1,9 +1,9 @@
 from mwa_qa.read_metafits import Metafits
 from scipy.interpolate import CubicSpline
 from scipy import signal
+from scipy import fft
 from astropy.io import fits
 import numpy as np
-import copy
 import os
 
 
@@ -52,6 +52,7 @@ class CalFits(object):
             self.frequency_flags = hdus['CHANBLOCKS'].data['Flag']
             self.frequency_channels = hdus['CHANBLOCKS'].data['Index']
             self.Nchan = len(self.frequency_array)
+            self._bh_window = self.blackmanharris(self.Nchan)
             self.convergence = result_hdu.data
             self.baseline_weights = bls_hdu.data
             self.norm = norm
@@ -80,7 +81,7 @@ class CalFits(object):
         or any malfunctioning reports
         """
         ind = self.gains_ind_for(self.reference_antenna)
-        flag = np.array(self.antenna_flags)[ind]
+        flag = self.antenna_flags[ind]
         assert flag == 0,  "{} seems to be flagged."
         "calibration solutions found, choose a different tile"
 
@@ -104,28 +105,21 @@ class CalFits(object):
         """
         Normalizes the gain solutions for each timeblock given a reference tile
         - data:	Input array of shape( tiles, freq, pols) containing the
-                        solutions
+                        solutions, leading (time) axes are also supported
         """
         ref_ind = self.gains_ind_for(self.reference_antenna)
-        refs = []
-        for ref in data[ref_ind].reshape((-1, 2, 2)):
-            refs.append(np.linalg.inv(ref))
-        refs = np.array(refs)
-        div_ref = []
-        for tile_i in data:
-            for (i, ref) in zip(tile_i, refs):
-                div_ref.append(i.reshape((2, 2)).dot(ref))
-        return np.array(div_ref).reshape(data.shape)
+        jones = data.reshape(data.shape[:-1] + (2, 2))
+        refs = np.linalg.inv(jones[..., ref_ind, :, :, :])
+        # broadcasting the reference solutions across the tile axis
+        div_ref = np.matmul(jones, refs[..., np.newaxis, :, :, :])
+        return div_ref.reshape(data.shape)
 
     def normalized_gains(self):
         """
         Returns the normalized gain solutions using the
         given reference Antenna number
         """
-        ngains = copy.deepcopy(self.gain_array)
-        for t in range(len(ngains)):
-            ngains[t] = self._normalized_data(self.gain_array[t])
-        return ngains
+        return self._normalized_data(self.gain_array)
 
     def gains_for_antnum(self, antnum):
         """
@@ -155,13 +149,7 @@ class CalFits(object):
         """
         m = Metafits(metafits_path)
         annumbers = m.antenna_numbers_for_receiver(receiver)
-        gains0 = self.gains_for_antnum(annumbers[0])
-        _sh = gains0.shape
-        gains_array = np.zeros(
-            (_sh[0], len(annumbers), _sh[1], _sh[2]), dtype=gains0.dtype)
-        for i, an in enumerate(annumbers):
-            gains_array[:, i, :, :] = self.gains_for_antnum(an)
-        return gains_array
+        return self.gain_array[:, self.gains_ind_for(annumbers), :, :]
 
     def blackmanharris(self, n):
         return signal.windows.blackmanharris(n)
@@ -178,19 +166,34 @@ class CalFits(object):
 
     def fft_gains(self):
         _sh = self.gain_array.shape
-        fft_data = np.zeros(_sh, dtype=self.gain_array.dtype)
-        window = self.blackmanharris(self.Nchan)
-        for t in range(_sh[0]):
-            for i in range(_sh[1]):
-                for j in range(_sh[3]):
-                    try:
-                        inds = np.where(~np.isnan(self.gain_array[t, i, :, j]))
-                        d_fft = np.fft.fft(self.interpolate_gains(
-                            inds[0], np.arange(self.Nchan), self.gain_array[t, i, inds[0], j]) * window)
-                        fft_data[t, i, :, j] = np.fft.fftshift(d_fft)
-                    except ValueError:
-                        fft_data[t, i, :, j] = np.nan
-        return fft_data
+        window = self._bh_window
+        # flattening to (time * tiles * pols, freq) rows
+        gains = np.moveaxis(self.gain_array, 2, -1).reshape(-1, _sh[2])
+        fft_data = np.full(gains.shape, np.nan, dtype=self.gain_array.dtype)
+        # rows sharing the same flagged channels are interpolated and
+        # transformed together, grouped on their bit-packed nan masks
+        masks = np.isnan(gains)
+        keys = np.packbits(masks, axis=1)
+        keys = keys.view('V{}'.format(keys.shape[1])).reshape(-1)
+        _, first, groups = np.unique(keys, return_index=True,
+                                     return_inverse=True)
+        groups = groups.reshape(-1)
+        # number of rows interpolated at once, bounds the spline memory
+        nblock = 128
+        for k, row in enumerate(first):
+            inds = np.where(~masks[row])[0]
+            group_rows = np.where(groups == k)[0]
+            for i in range(0, len(group_rows), nblock):
+                rows = group_rows[i:i + nblock]
+                try:
+                    data = self.interpolate_gains(
+                        inds, np.arange(self.Nchan), gains[rows][:, inds].T).T
+                except ValueError:
+                    continue
+                d_fft = fft.fft(data * window, axis=-1, workers=-1)
+                fft_data[rows] = fft.fftshift(d_fft, axes=-1)
+        fft_data = fft_data.reshape(_sh[0], _sh[1], _sh[3], _sh[2])
+        return np.ascontiguousarray(np.moveaxis(fft_data, -1, 2))
 
     def write_to(self, filename, overwrite=False):
         """
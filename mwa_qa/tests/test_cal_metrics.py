@@ -1,7 +1,8 @@
 from collections import OrderedDict
-from mwa_qa.cal_metrics import CalMetrics
+from mwa_qa.cal_metrics import CalMetrics, _modified_zscore
 from astropy.io import fits
 from mwa_qa.data import DATA_PATH
+from unittest import mock
 import unittest
 import numpy as np
 import os
@@ -132,6 +133,11 @@ class TestCalMetrics(unittest.TestCase):
         np.testing.assert_almost_equal(
             conv_variance, 2.0160385085922676e-15)
 
+    def test_modified_zscore(self):
+        data = np.array([1., 2., 3., 4., 100., np.nan])
+        np.testing.assert_almost_equal(_modified_zscore(data), np.array(
+            [-2., -1., 0., 1., 97., np.nan]))
+
     def test_initialize_metrics_dict(self):
         m = CalMetrics(calfile, metafits)
         m._initialize_metrics_dict()
@@ -222,6 +228,26 @@ class TestCalMetrics(unittest.TestCase):
                                                 0.17452712, 0.66135147, 0.67545852, 0.60077982, 0.5961326]))
         self.assertEqual(m.metrics['YY']['DFFT_POWER'], 166956.96124389415)
 
+    def test_run_metrics_bad_ants(self):
+        m = CalMetrics(calfile, metafits)
+        nants = len(m.CalFits.antenna)
+
+        def modz(outliers):
+            zscores = np.zeros(nants)
+            zscores[outliers] = 20.
+            return zscores
+        # modified zscores for XX rms, XX fft, YY rms and YY fft in turn
+        side_effect = [modz([3]), modz([5]), modz([10]), modz([5, 20])]
+        with mock.patch('mwa_qa.cal_metrics._modified_zscore',
+                        side_effect=side_effect):
+            m.run_metrics()
+        np.testing.assert_equal(m.metrics['XX']['BAD_ANTS'], np.array([3, 5]))
+        np.testing.assert_equal(
+            m.metrics['YY']['BAD_ANTS'], np.array([5, 10, 20]))
+        np.testing.assert_equal(
+            m.metrics['BAD_ANTS'], np.array([3, 5, 10, 20]))
+        self.assertEqual(m.metrics['PERCENT_BAD_ANTS'], 4 / nants * 100)
+
     def test_write_metrics(self):
         m = CalMetrics(calfile, metafits)
         m._initialize_metrics_dict()
@@ -1,5 +1,6 @@
 from mwa_qa.read_calfits import CalFits
 from mwa_qa.data import DATA_PATH
+from scipy.interpolate import CubicSpline
 from scipy import signal
 import unittest
 import numpy as np
@@ -91,6 +92,7 @@ class TestCalFits(unittest.TestCase):
         expected = np.array([0.79296893-0.62239205j,  0.01225656+0.05076904j,
                              0.02343749-0.05114198j, -0.44148823-1.04256351j])
         np.testing.assert_almost_equal(ngains[0, 0, 100, :], expected)
+        self.assertFalse(np.shares_memory(ngains, c.gain_array))
 
     def test_gains_for_antnum(self):
         c = CalFits(calfile, norm=True)
@@ -124,6 +126,7 @@ class TestCalFits(unittest.TestCase):
         self.assertEqual(len(bm_filter), n)
         expected = signal.windows.blackmanharris(n)
         np.testing.assert_almost_equal(bm_filter, expected)
+        np.testing.assert_almost_equal(c._bh_window, expected)
 
     def test_delays(self):
         c = CalFits(calfile)
@@ -139,3 +142,41 @@ class TestCalFits(unittest.TestCase):
         np.testing.assert_almost_equal(fft_gains[0, 0, 100, :],
                                        np.array([-0.25229746-0.15715837j,  0.08903429-0.06886878j,
                                                  -0.0102906 - 0.11353449j, -0.07726732+0.18713528j]))
+
+    def test_gains_fft_nan_patterns(self):
+        ntime, nant, nchan, npol = 2, 40, 32, 4
+        rng = np.random.default_rng(0)
+        gains = rng.normal(size=(ntime, nant, nchan, npol)) + \
+            1j * rng.normal(size=(ntime, nant, nchan, npol))
+        gains[:, 1, 5, :] = np.nan
+        gains[:, 5, 10:14, 1] = np.nan
+        # all channels flagged
+        gains[0, 2, :, 0] = np.nan
+        # single valid channel
+        gains[1, 3, :, 2] = np.nan
+        gains[1, 3, 7, 2] = 1 + 1j
+        # two valid channels
+        gains[0, 4, :, 3] = np.nan
+        gains[0, 4, [3, 20], 3] = [1 + 1j, 2 - 1j]
+        c = CalFits.__new__(CalFits)
+        c.gain_array = gains
+        c.Nchan = nchan
+        c._bh_window = c.blackmanharris(nchan)
+        fft_gains = c.fft_gains()
+        self.assertEqual(fft_gains.shape, gains.shape)
+        expected = np.full(gains.shape, np.nan, dtype=gains.dtype)
+        for t in range(ntime):
+            for i in range(nant):
+                for j in range(npol):
+                    inds = np.where(~np.isnan(gains[t, i, :, j]))[0]
+                    try:
+                        data = CubicSpline(inds, gains[t, i, inds, j])(
+                            np.arange(nchan))
+                    except ValueError:
+                        continue
+                    expected[t, i, :, j] = np.fft.fftshift(
+                        np.fft.fft(data * c._bh_window))
+        self.assertTrue(np.all(np.isnan(fft_gains[0, 2, :, 0])))
+        self.assertTrue(np.all(np.isnan(fft_gains[1, 3, :, 2])))
+        self.assertFalse(np.any(np.isnan(fft_gains[0, 4, :, 3])))
+        np.testing.assert_almost_equal(fft_gains, expected)
@@ -116,14 +116,14 @@ class VisMetrics(object):
         # sigma rule
         modz_xx_sum = np.sum(modz_gridxx, axis=1)
         modz_yy_sum = np.sum(modz_gridyy, axis=1)
-        lthreshxx_sum = np.nanmean(
-            modz_xx_sum) - self.cutoff_threshold * np.nanstd(modz_xx_sum)
-        uthreshxx_sum = np.nanmean(
-            modz_xx_sum) + self.cutoff_threshold * np.nanstd(modz_xx_sum)
-        lthreshyy_sum = np.nanmean(
-            modz_yy_sum) - self.cutoff_threshold * np.nanstd(modz_yy_sum)
-        uthreshyy_sum = np.nanmean(
-            modz_yy_sum) + self.cutoff_threshold * np.nanstd(modz_yy_sum)
+        meanxx_sum = np.nanmean(modz_xx_sum)
+        stdxx_sum = np.nanstd(modz_xx_sum)
+        meanyy_sum = np.nanmean(modz_yy_sum)
+        stdyy_sum = np.nanstd(modz_yy_sum)
+        lthreshxx_sum = meanxx_sum - self.cutoff_threshold * stdxx_sum
+        uthreshxx_sum = meanxx_sum + self.cutoff_threshold * stdxx_sum
+        lthreshyy_sum = meanyy_sum - self.cutoff_threshold * stdyy_sum
+        uthreshyy_sum = meanyy_sum + self.cutoff_threshold * stdyy_sum
         inds_xx = np.where((modz_xx_sum < lthreshxx_sum) |
                            (modz_xx_sum > uthreshxx_sum))
         inds_yy = np.where((modz_yy_sum < lthreshyy_sum) |
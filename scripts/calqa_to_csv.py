@@ -30,7 +30,7 @@ for p in ['XX', 'YY']:
     for pk in pol_keys:
         keys.append('{}_{}'.format(pk, p))
 
-df = pd.DataFrame(columns=keys)
+rows = []
 for i, json in enumerate(args.json):
     print(i, ' Reading {}'.format(json))
     data = ut.load_json(json)
@@ -41,7 +41,8 @@ for i, json in enumerate(args.json):
         row[k] = data['XX'][pol_keys[j]]
     for j, k in enumerate(keys[nmkeys + npkeys:nmkeys + 2 * npkeys]):
         row[k] = data['YY'][pol_keys[j]]
-    df = df.append(row, ignore_index=True)
+    rows.append(row)
+df = pd.DataFrame(rows, columns=keys)
 
 if args.outfile is None:
     outfile = 'calqa_combined.csv'